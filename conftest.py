@@ -0,0 +1,19 @@
+import sys
+import types
+
+try:
+    import frappe  # noqa: F401
+except ImportError:
+    # fix_null_modules only needs get_app_path and scrub; tests point
+    # get_app_path at a temporary app directory.
+    frappe = types.ModuleType("frappe")
+
+    def get_app_path(app, *joins):
+        raise RuntimeError("tests must monkeypatch frappe.get_app_path")
+
+    def scrub(txt):
+        return txt.replace(" ", "_").replace("-", "_").lower()
+
+    frappe.get_app_path = get_app_path
+    frappe.scrub = scrub
+    sys.modules["frappe"] = frappe
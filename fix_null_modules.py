@@ -6,13 +6,80 @@ updates custom JSON metadata, and ensures fixtures have correct module
 values based on discovered mappings.
 """
 
+import os
 import re
 import json
+import mmap
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, suppress
+from functools import lru_cache, partial
+from itertools import repeat
 from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, Sequence, TypeVar
 
 import frappe
 from frappe import scrub
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+_T = TypeVar("_T")
+
+# Distinguishes a missing "module" key from an explicit null.
+_MISSING = object()
+
+# Cheap pre-check on raw bytes: files without a null module are not parsed.
+_NULL_MODULE_RE = re.compile(rb'"module"\s*:\s*null')
+
+# orjson only handles integers in [-2**63, 2**64) and may parse others as
+# floats. Those all have at least 19 digits, so any run of 19+ digits
+# sends the file to json.loads.
+_LONG_INT_RE = re.compile(rb"\d{19}")
+
+# A top-level JSON array; only these fixtures can be streamed item by item.
+_JSON_ARRAY_RE = re.compile(rb"\s*\[")
+
+# Fixtures at least this large are streamed with ijson when it is installed.
+# ijson raises on integers wider than 64 bits and NaN/Infinity, which
+# json.loads accepts, and may raise UnicodeDecodeError on lone surrogates;
+# such files fall back to the full-load path. It also silently turns some
+# lone-surrogate escapes such as "\ud800" into "?", so files where
+# _LONE_SURROGATE_RE finds one are never streamed.
+_STREAM_MIN_BYTES = 10 * 1024 * 1024
+
+# A \uD800-\uDFFF escape that is not part of a surrogate pair.
+_LONE_SURROGATE_RE = re.compile(
+    rb"\\u[dD][89abAB][0-9a-fA-F]{2}(?!\\u[dD][c-fC-F])"
+    rb"|(?<!\\u[dD][89abAB][0-9a-fA-F]{2})\\u[dD][c-fC-F][0-9a-fA-F]{2}"
+)
+
+# Below this many files, starting worker processes costs more than it saves.
+_PARALLEL_MIN_FILES = 8
+
+
+@lru_cache(maxsize=32)
+def _app_path(app: str) -> Path:
+    """
+    Return the app's package path, resolved once per app.
+
+    Args:
+        app: The Frappe app name.
+
+    Returns:
+        Path of the app's Python package.
+    """
+    return Path(frappe.get_app_path(app))
+
 
 def build_module_map(app: str) -> dict[str, str]:
     """
@@ -31,21 +98,19 @@ def build_module_map(app: str) -> dict[str, str]:
     Raises:
         FileNotFoundError: If modules.txt is missing.
     """
-    modules_path = Path(frappe.get_app_path(app)) / "modules.txt"
+    modules_path = _app_path(app) / "modules.txt"
 
     if not modules_path.exists():
         raise FileNotFoundError(f"modules.txt not found at {modules_path}")
 
-    module_names = [
-        line.strip()
+    return {
+        name: scrub(name)
         for line in modules_path.read_text().splitlines()
-        if line.strip()
-    ]
-
-    return {name: scrub(name) for name in module_names}
+        if (name := line.strip())
+    }
 
 
-def merge_maps(map_build: dict, map_user: dict) -> dict:
+def merge_maps(map_build: dict[str, str], map_user: dict[str, str]) -> dict[str, str]:
     """
     Merge the auto-generated module map with the user-defined override map.
 
@@ -61,24 +126,171 @@ def merge_maps(map_build: dict, map_user: dict) -> dict:
     Returns:
         A merged and conflict-resolved module map.
     """
-    final = map_build.copy()
     user_values = set(map_user.values())
 
-    keys_to_remove = [
-        key for key, value in final.items()
-        if value in user_values and key not in map_user
-    ]
+    return {
+        key: value for key, value in map_build.items()
+        if key in map_user or value not in user_values
+    } | map_user
+
+
+def _json_loads(raw: bytes) -> Any:
+    """
+    Parse JSON bytes, preferring orjson when it is installed.
+
+    orjson is much faster than the stdlib parser but stricter: it limits
+    integers to 64 bits and rejects NaN, Infinity and lone surrogates,
+    all of which json.loads accepts. Files that may contain wider
+    integers, or that orjson rejects, are parsed with json.loads so their
+    contents come back unchanged.
+
+    Args:
+        raw: The file contents.
+
+    Returns:
+        The parsed JSON data.
+    """
+    if orjson is not None and not _LONG_INT_RE.search(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+
+    return json.loads(raw)
+
+
+def _list_json_files(folder: str | os.PathLike[str]) -> list[str]:
+    """
+    List the JSON files directly inside a folder.
+
+    Uses a single scandir pass and returns plain string paths, avoiding
+    the per-entry Path objects and extra stat calls of Path.glob.
+
+    Args:
+        folder: Directory to scan.
+
+    Returns:
+        Paths of the regular `*.json` files in the folder.
+    """
+    with os.scandir(folder) as entries:
+        return [
+            entry.path for entry in entries
+            if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+        ]
+
+
+class _KeepOriginal(Exception):
+    """Raised inside _replace_file to discard the new contents."""
+
+
+@contextmanager
+def _replace_file(json_file: str) -> Iterator[BinaryIO]:
+    """
+    Atomically replace a file with whatever is written to the yielded handle.
+
+    Writes go to a uniquely named temporary file next to the target,
+    which is renamed over it when the block exits cleanly, so a failed
+    write never leaves truncated JSON. Raise _KeepOriginal inside the
+    block to discard the temporary file and leave the target untouched.
+    The file mode is copied over, and the owner and group are restored
+    where permitted, so a run under sudo does not leave files owned by
+    root that the frappe user can no longer write.
+
+    Args:
+        json_file: Path of the file to replace.
+
+    Yields:
+        A binary file handle for the new contents.
+    """
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(json_file), suffix=".tmp")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        shutil.copymode(json_file, tmp_file)
+        st = os.stat(json_file)
+        with suppress(PermissionError):
+            os.chown(tmp_file, st.st_uid, st.st_gid)
+        os.replace(tmp_file, json_file)
+    except _KeepOriginal:
+        os.remove(tmp_file)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(tmp_file)
+        raise
+
+
+def _write_json(json_file: str, data: Any) -> None:
+    """
+    Serialize data once and atomically replace a JSON file with it.
+
+    Args:
+        json_file: Path of the file to write.
+        data: JSON-serializable Python objects.
+    """
+    buf = json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+
+    with _replace_file(json_file) as f:
+        f.write(buf)
+
+
+def _map_files(func: Callable[..., _T], *iterables: Sequence[Any]) -> list[_T]:
+    """
+    Apply a per-file function, fanning out to worker processes.
+
+    Each file is read, fixed, and written independently, so the work is
+    spread over a process pool. Small batches run in-process.
+
+    Args:
+        func: Picklable module-level function to call per file.
+        *iterables: Argument sequences, as for the builtin map.
+
+    Returns:
+        The results of func, in input order.
+    """
+    if len(iterables[0]) < _PARALLEL_MIN_FILES:
+        return list(map(func, *iterables))
+
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, *iterables, chunksize=8))
 
-    for key in keys_to_remove:
-        del final[key]
 
-    final.update(map_user)
-    return final
+def _iter_null_module_objects(data: Any) -> Iterator[dict[str, Any]]:
+    """
+    Yield every JSON object in the tree whose module field is null.
 
+    Shared traversal for the custom and fixture walkers. Uses an explicit
+    stack rather than recursion; callers may set the yielded object's
+    module field before resuming.
 
-def replace_module_in_json_in_customs(data, module_name, mapping_custom_to_module):
+    Args:
+        data: JSON data loaded into Python objects (dict/list).
+
+    Yields:
+        Dicts containing `"module": None`.
     """
-    Recursively update custom JSON data, setting missing module fields.
+    stack: list[Any] = [data]
+
+    while stack:
+        node = stack.pop()
+
+        if type(node) is dict:
+            if node.get("module", _MISSING) is None:
+                yield node
+
+            for value in node.values():
+                if type(value) is dict or type(value) is list:
+                    stack.append(value)
+
+        elif type(node) is list:
+            stack.extend(item for item in node if type(item) is dict or type(item) is list)
+
+
+def replace_module_in_json_in_customs(
+    data: Any, module_name: str, mapping_custom_to_module: dict[str, str]
+) -> tuple[Any, int, int]:
+    """
+    Update custom JSON data in place, setting missing module fields.
 
     If a JSON object contains `"module": null`, this function replaces it
     with the provided module name and stores the mapping of docname →
@@ -90,36 +302,65 @@ def replace_module_in_json_in_customs(data, module_name, mapping_custom_to_modul
         mapping_custom_to_module: Dict to store docname → module mapping.
 
     Returns:
-        The updated JSON structure.
+        A tuple of the updated JSON structure, the number of module
+        fields set, and the number of objects skipped for lacking a name.
     """
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if key == "module" and value is None:
-                try:
-                    docname = data["name"]
-                except Exception:
-                    print("  ⚠️  WARNING: Found module=None but JSON object has no 'name'. Skipping...")
-                    continue
+    updated = skipped = 0
 
-                data[key] = module_name
-                mapping_custom_to_module[docname] = module_name
-            else:
-                replace_module_in_json_in_customs(value, module_name, mapping_custom_to_module)
+    for node in _iter_null_module_objects(data):
+        docname = node.get("name")
+        if docname is None:
+            skipped += 1
+            continue
 
-    elif isinstance(data, list):
-        for item in data:
-            replace_module_in_json_in_customs(item, module_name, mapping_custom_to_module)
+        node["module"] = module_name
+        mapping_custom_to_module[docname] = module_name
+        updated += 1
 
-    return data
+    return data, updated, skipped
 
 
-def fix_custom_json_modules(app: str, final_map: dict, mapping_custom_to_module: dict):
+def _fix_custom_file(json_file: str, module_name: str) -> list[str]:
+    """
+    Fix module values in a single custom JSON file.
+
+    Args:
+        json_file: Path of the custom JSON file.
+        module_name: The module name to assign when missing.
+
+    Returns:
+        The docnames that were assigned module_name in this file.
+    """
+    raw = Path(json_file).read_bytes()
+    if not _NULL_MODULE_RE.search(raw):
+        return []
+
+    mapping: dict[str, str] = {}
+    data = _json_loads(raw)
+
+    updated_data, updated, skipped = replace_module_in_json_in_customs(data, module_name, mapping)
+
+    if skipped:
+        print(f"  ⚠️  WARNING: {json_file}: {skipped} object(s) with module=None but no 'name'. Skipped.")
+
+    if updated:
+        _write_json(json_file, updated_data)
+        print(f"  ✅ {json_file}: {updated} module field(s) set.")
+
+    return list(mapping)
+
+
+def fix_custom_json_modules(
+    app: str, final_map: dict[str, str], mapping_custom_to_module: dict[str, str]
+) -> None:
     """
     Update module values inside all custom JSON files in the app.
 
     Iterates through each module’s `custom` folder and ensures that JSON
-    metadata has correct module names. Updates the mapping of custom
-    documents to module names for later use in fixture processing.
+    metadata has correct module names. Files are processed in parallel;
+    their docnames are collected in folder order and the mapping of
+    custom documents to module names is filled in one bulk update
+    afterwards, for later use in fixture processing.
 
     Args:
         app: The Frappe app name.
@@ -127,30 +368,46 @@ def fix_custom_json_modules(app: str, final_map: dict, mapping_custom_to_module:
         mapping_custom_to_module: A dictionary that will be populated
             with docname → module name mappings.
     """
-    app_path = Path(frappe.get_app_path(app))
+    app_path = _app_path(app)
+    json_files = []
+    module_names = []
+
+    with os.scandir(app_path) as entries:
+        module_folders = {entry.name for entry in entries if entry.is_dir()}
 
     for original_module_name, normalized_name in final_map.items():
-        module_folder = app_path / normalized_name / "custom"
-        if not module_folder.exists():
+        # Several original names may share a folder; the first one wins,
+        # and queueing the folder twice would let workers race on its files.
+        if normalized_name not in module_folders:
             continue
+        module_folders.discard(normalized_name)
 
-        for json_file in module_folder.glob("*.json"):
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+        try:
+            custom_files = _list_json_files(os.path.join(app_path, normalized_name, "custom"))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        for json_file in custom_files:
+            json_files.append(json_file)
+            module_names.append(original_module_name)
 
-            updated_data = replace_module_in_json_in_customs(
-                data,
-                original_module_name,
-                mapping_custom_to_module
-            )
+    docnames: list[str] = []
+    docname_modules: list[str] = []
 
-            with open(json_file, "w", encoding="utf-8") as f:
-                json.dump(updated_data, f, indent=4, ensure_ascii=False)
+    for module_name, file_docnames in zip(
+        module_names, _map_files(_fix_custom_file, json_files, module_names)
+    ):
+        docnames.extend(file_docnames)
+        docname_modules.extend(repeat(module_name, len(file_docnames)))
 
+    mapping_custom_to_module.update(zip(docnames, docname_modules))
 
-def replace_module_in_json_in_fixture(data, mapping_custom_to_module, app_name):
+
+def replace_module_in_json_in_fixture(
+    data: Any, mapping_custom_to_module: dict[str, str], app_name: str
+) -> tuple[Any, int, int]:
     """
-    Recursively update fixture JSON data to have correct module names.
+    Update fixture JSON data in place to have correct module names.
 
     If a fixture item has `"module": null`, it is replaced by:
         - the module name associated with the corresponding docname,
@@ -163,33 +420,24 @@ def replace_module_in_json_in_fixture(data, mapping_custom_to_module, app_name):
         app_name: Fallback module name.
 
     Returns:
-        The updated JSON data.
+        A tuple of the updated JSON data, the number of module fields
+        set, and the number of items skipped for lacking a name.
     """
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if key == "module" and value is None:
-                try:
-                    docname = data["name"]
-                except Exception:
-                    print("  ⚠️  Fixture item missing 'name' key. Skipping item...")
-                    continue
-
-                if docname in mapping_custom_to_module:
-                    data[key] = mapping_custom_to_module[docname]
-                else:
-                    data[key] = app_name
+    updated = skipped = 0
 
-            else:
-                replace_module_in_json_in_fixture(value, mapping_custom_to_module, app_name)
+    for node in _iter_null_module_objects(data):
+        docname = node.get("name")
+        if docname is None:
+            skipped += 1
+            continue
 
-    elif isinstance(data, list):
-        for item in data:
-            replace_module_in_json_in_fixture(item, mapping_custom_to_module, app_name)
+        node["module"] = mapping_custom_to_module.get(docname, app_name)
+        updated += 1
 
-    return data
+    return data, updated, skipped
 
 
-def get_app_module_name(final_map: dict, app: str) -> str:
+def get_app_module_name(reverse_map: dict[str, str], app: str) -> str:
     """
     Determine the fallback module name for fixtures.
 
@@ -197,19 +445,134 @@ def get_app_module_name(final_map: dict, app: str) -> str:
     equals the application name. If none match, the app name is returned.
 
     Args:
-        final_map: Mapping of original → normalized module names.
+        reverse_map: Mapping of normalized → original module names.
         app: The Frappe app name.
 
     Returns:
         The best fallback module name.
     """
-    for original, normalized in final_map.items():
-        if normalized == app:
-            return original
-    return app
+    return reverse_map.get(app, app)
+
 
+def _report_fixture_file(json_file: str, updated: int, skipped: int) -> None:
+    """
+    Print the per-file summary of fixture module fixes.
 
-def fix_fixture_modules(app: str, mapping_custom_to_module: dict, final_map: dict):
+    Args:
+        json_file: Path of the fixture JSON file.
+        updated: Number of module fields set.
+        skipped: Number of items skipped for lacking a name.
+    """
+    if skipped:
+        print(f"  ⚠️  {json_file}: {skipped} fixture item(s) missing 'name' key. Skipped.")
+
+    if updated:
+        print(f"  ✅ {json_file}: {updated} module field(s) set.")
+
+
+def _stream_fix_fixture_file(
+    json_file: str, mapping_custom_to_module: dict[str, str], app_name: str
+) -> tuple[int, int] | None:
+    """
+    Fix module values in a large fixture file one top-level item at a time.
+
+    Items are parsed with ijson, fixed, and written to a temporary file
+    in the same format as _write_json, so memory use is bounded by the
+    largest item rather than the whole file. The temporary file replaces
+    the original only if a module field was set.
+
+    Args:
+        json_file: Path of the fixture JSON file.
+        mapping_custom_to_module: Mapping of docname → module.
+        app_name: Fallback module name.
+
+    Returns:
+        The numbers of module fields set and items skipped, or None if
+        the file must be loaded whole: it is not a top-level array, or
+        it hits one of the ijson limits noted at _STREAM_MIN_BYTES.
+    """
+    with open(json_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if not _JSON_ARRAY_RE.match(mm):
+            return None
+        if not _NULL_MODULE_RE.search(mm):
+            return 0, 0
+        if _LONE_SURROGATE_RE.search(mm):
+            return None
+
+    updated = skipped = 0
+
+    try:
+        with open(json_file, "rb") as src, _replace_file(json_file) as dst:
+            dst.write(b"[")
+            separator = b"\n    "
+
+            for item in ijson.items(src, "item", use_float=True):
+                _, item_updated, item_skipped = replace_module_in_json_in_fixture(
+                    item,
+                    mapping_custom_to_module,
+                    app_name
+                )
+                updated += item_updated
+                skipped += item_skipped
+
+                # JSON strings never contain raw newlines, so indenting
+                # every line nests the item one level inside the array.
+                encoded = json.dumps(item, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+                dst.write(separator)
+                dst.write(encoded.encode("utf-8"))
+                separator = b",\n    "
+
+            dst.write(b"]" if separator == b"\n    " else b"\n]")
+
+            if not updated:
+                raise _KeepOriginal
+    except (ijson.JSONError, UnicodeDecodeError):
+        return None
+
+    return updated, skipped
+
+
+def _fix_fixture_file(
+    json_file: str, mapping_custom_to_module: dict[str, str], app_name: str
+) -> None:
+    """
+    Fix module values in a single fixture JSON file.
+
+    Large top-level array fixtures are streamed when ijson is available;
+    everything else is loaded whole.
+
+    Args:
+        json_file: Path of the fixture JSON file.
+        mapping_custom_to_module: Mapping of docname → module.
+        app_name: Fallback module name.
+    """
+    if ijson is not None and os.path.getsize(json_file) >= _STREAM_MIN_BYTES:
+        counts = _stream_fix_fixture_file(json_file, mapping_custom_to_module, app_name)
+        if counts is not None:
+            _report_fixture_file(json_file, *counts)
+            return
+
+    raw = Path(json_file).read_bytes()
+    if not _NULL_MODULE_RE.search(raw):
+        return
+
+    data = _json_loads(raw)
+
+    updated_data, updated, skipped = replace_module_in_json_in_fixture(
+        data,
+        mapping_custom_to_module,
+        app_name
+    )
+
+    if updated:
+        _write_json(json_file, updated_data)
+
+    _report_fixture_file(json_file, updated, skipped)
+
+
+def fix_fixture_modules(
+    app: str, mapping_custom_to_module: dict[str, str], final_map: dict[str, str]
+) -> None:
     """
     Update all JSON fixture files in the app to ensure correct module
     assignments.
@@ -222,30 +585,24 @@ def fix_fixture_modules(app: str, mapping_custom_to_module: dict, final_map: dic
         mapping_custom_to_module: Mapping of docname → module name.
         final_map: Final merged module map.
     """
-    app_path = Path(frappe.get_app_path(app))
+    app_path = _app_path(app)
     fixtures_path = app_path / "fixtures"
 
     if not fixtures_path.exists():
         print("⚠️  No fixtures directory found — skipping.")
         return
 
-    app_name = get_app_module_name(final_map, app)
-
-    for json_file in fixtures_path.glob("*.json"):
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        updated_data = replace_module_in_json_in_fixture(
-            data,
-            mapping_custom_to_module,
-            app_name
-        )
+    # Iterate in reverse so the first original name wins for duplicates.
+    reverse_map = {normalized: original for original, normalized in reversed(final_map.items())}
+    app_name = get_app_module_name(reverse_map, app)
 
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(updated_data, f, indent=4, ensure_ascii=False)
+    _map_files(
+        partial(_fix_fixture_file, mapping_custom_to_module=mapping_custom_to_module, app_name=app_name),
+        _list_json_files(fixtures_path),
+    )
 
 
-def run(app: str, custom_override_map: dict | None = None):
+def run(app: str, custom_override_map: dict[str, str] | None = None) -> dict[str, dict[str, str]]:
     """
     Entry point for bench execute.
 
@@ -260,7 +617,7 @@ def run(app: str, custom_override_map: dict | None = None):
     if custom_override_map is None:
         custom_override_map = {}
 
-    mapping_custom_to_module = {}
+    mapping_custom_to_module: dict[str, str] = {}
 
     auto_map = build_module_map(app)
     final_map = merge_maps(auto_map, custom_override_map)
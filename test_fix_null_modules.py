@@ -0,0 +1,311 @@
+import json
+import os
+
+import pytest
+
+import fix_null_modules
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    app_path = tmp_path / "myapp"
+    app_path.mkdir()
+    monkeypatch.setattr(fix_null_modules.frappe, "get_app_path", lambda app: str(app_path))
+    fix_null_modules._app_path.cache_clear()
+    yield app_path
+    fix_null_modules._app_path.cache_clear()
+
+
+def test_duplicate_module_folder_is_processed_once(app_dir, monkeypatch):
+    (app_dir / "modules.txt").write_text("My App\nmy-app\n")
+    custom_dir = app_dir / "my_app" / "custom"
+    custom_dir.mkdir(parents=True)
+
+    for i in range(16):
+        (custom_dir / f"doc_{i}.json").write_text(
+            json.dumps({"custom_fields": [{"name": f"D{i}", "module": None}]}, indent=4)
+        )
+
+    queued = []
+    map_files = fix_null_modules._map_files
+
+    def spy_map_files(func, *iterables):
+        queued.extend(iterables[0])
+        return map_files(func, *iterables)
+
+    monkeypatch.setattr(fix_null_modules, "_PARALLEL_MIN_FILES", 1)
+    monkeypatch.setattr(fix_null_modules, "_map_files", spy_map_files)
+
+    result = fix_null_modules.run("myapp")
+
+    assert len(queued) == len(set(queued)) == 16
+    assert result["custom_mappings"] == {f"D{i}": "My App" for i in range(16)}
+
+    for i in range(16):
+        data = json.loads((custom_dir / f"doc_{i}.json").read_text())
+        assert data["custom_fields"][0]["module"] == "My App"
+
+    assert not list(custom_dir.glob("*.tmp"))
+
+
+def _write_custom_app(app_dir):
+    (app_dir / "modules.txt").write_text("MyApp\nHR Stuff\n")
+    (app_dir / "myapp" / "custom").mkdir(parents=True)
+    custom_dir = app_dir / "hr_stuff" / "custom"
+    custom_dir.mkdir(parents=True)
+
+    for i in range(12):
+        (custom_dir / f"doc_{i}.json").write_text(json.dumps({
+            "custom_fields": [{"name": f"F{i}", "module": None}, {"module": None}],
+            "property_setters": [{"name": f"P{i}", "module": "Keep"}],
+        }, indent=4))
+
+    fixtures_dir = app_dir / "fixtures"
+    fixtures_dir.mkdir()
+    (fixtures_dir / "custom_field.json").write_text(json.dumps(
+        [{"name": "F3", "module": None}, {"name": "Other", "module": None}], indent=4
+    ))
+
+
+def _read_tree(app_dir):
+    return {
+        str(path.relative_to(app_dir)): path.read_text()
+        for path in sorted(app_dir.rglob("*.json"))
+    }
+
+
+def test_pool_and_in_process_paths_agree(tmp_path, monkeypatch):
+    results = {}
+
+    for min_files in (1, 10_000):
+        app_dir = tmp_path / str(min_files) / "myapp"
+        app_dir.mkdir(parents=True)
+        _write_custom_app(app_dir)
+
+        monkeypatch.setattr(fix_null_modules.frappe, "get_app_path", lambda app, d=app_dir: str(d))
+        monkeypatch.setattr(fix_null_modules, "_PARALLEL_MIN_FILES", min_files)
+        fix_null_modules._app_path.cache_clear()
+
+        results[min_files] = (fix_null_modules.run("myapp"), _read_tree(app_dir))
+
+    fix_null_modules._app_path.cache_clear()
+
+    assert results[1] == results[10_000]
+    run_result, tree = results[1]
+    assert run_result["custom_mappings"] == {f"F{i}": "HR Stuff" for i in range(12)}
+    assert json.loads(tree["fixtures/custom_field.json"]) == [
+        {"name": "F3", "module": "HR Stuff"},
+        {"name": "Other", "module": "MyApp"},
+    ]
+
+
+def _merge_maps_baseline(map_build, map_user):
+    final = map_build.copy()
+    user_values = set(map_user.values())
+
+    for key in [k for k, v in final.items() if v in user_values and k not in map_user]:
+        del final[key]
+
+    final.update(map_user)
+    return final
+
+
+@pytest.mark.parametrize("map_user", [
+    {},
+    {"B": "x"},
+    {"B": "x", "Z": "d", "E": "q"},
+    {"New": "a"},
+])
+def test_merge_maps_matches_copy_and_delete(map_user):
+    map_build = {"A": "a", "B": "x", "C": "x", "D": "d", "E": "e"}
+
+    merged = fix_null_modules.merge_maps(map_build, map_user)
+
+    assert list(merged.items()) == list(_merge_maps_baseline(map_build, map_user).items())
+
+
+def test_get_app_module_name_uses_reverse_map():
+    reverse_map = {"myapp": "MyApp", "hr": "HR"}
+
+    assert fix_null_modules.get_app_module_name(reverse_map, "myapp") == "MyApp"
+    assert fix_null_modules.get_app_module_name(reverse_map, "unknown_app") == "unknown_app"
+
+
+def test_fix_fixture_modules_keeps_first_original_name(app_dir):
+    fixtures_dir = app_dir / "fixtures"
+    fixtures_dir.mkdir()
+    (fixtures_dir / "a.json").write_text(json.dumps([{"name": "X", "module": None}]))
+
+    fix_null_modules.fix_fixture_modules("myapp", {}, {"MyApp": "myapp", "My-App": "myapp"})
+
+    assert json.loads((fixtures_dir / "a.json").read_text()) == [{"name": "X", "module": "MyApp"}]
+
+
+def test_replace_file_replaces_and_keeps_mode(tmp_path):
+    target = tmp_path / "a.json"
+    target.write_text("old")
+    os.chmod(target, 0o640)
+
+    with fix_null_modules._replace_file(str(target)) as f:
+        f.write(b"new")
+
+    assert target.read_text() == "new"
+    assert os.stat(target).st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+def test_replace_file_restores_owner_and_group(tmp_path, monkeypatch):
+    target = tmp_path / "a.json"
+    target.write_text("old")
+    st = os.stat(target)
+    chown_calls = []
+    monkeypatch.setattr(fix_null_modules.os, "chown", lambda *args: chown_calls.append(args))
+
+    with fix_null_modules._replace_file(str(target)) as f:
+        f.write(b"new")
+
+    assert [(uid, gid) for _, uid, gid in chown_calls] == [(st.st_uid, st.st_gid)]
+    assert target.read_text() == "new"
+
+
+def test_replace_file_ignores_chown_permission_error(tmp_path, monkeypatch):
+    target = tmp_path / "a.json"
+    target.write_text("old")
+
+    def deny_chown(*args):
+        raise PermissionError
+
+    monkeypatch.setattr(fix_null_modules.os, "chown", deny_chown)
+
+    with fix_null_modules._replace_file(str(target)) as f:
+        f.write(b"new")
+
+    assert target.read_text() == "new"
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+def test_replace_file_keep_original_discards_new_contents(tmp_path):
+    target = tmp_path / "a.json"
+    target.write_text("old")
+
+    with fix_null_modules._replace_file(str(target)) as f:
+        f.write(b"new")
+        raise fix_null_modules._KeepOriginal
+
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+def test_replace_file_cleans_up_on_error(tmp_path):
+    target = tmp_path / "a.json"
+    target.write_text("old")
+
+    with pytest.raises(ValueError):
+        with fix_null_modules._replace_file(str(target)) as f:
+            f.write(b"partial")
+            raise ValueError("boom")
+
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+@pytest.mark.parametrize("raw", [
+    b'{"name": "A", "module": null, "big": -9223372036854775809}',
+    b'{"name": "A", "module": null, "big": 18446744073709551616}',
+    b'{"name": "A", "module": null, "f": NaN, "g": -Infinity}',
+    b'{"name": "A", "module": null, "s": "\\ud800"}',
+])
+def test_json_loads_matches_stdlib(raw):
+    # json.dumps compares NaN by text, since NaN != NaN.
+    assert json.dumps(fix_null_modules._json_loads(raw)) == json.dumps(json.loads(raw))
+
+
+def test_custom_file_keeps_integers_below_int64_min(tmp_path):
+    json_file = tmp_path / "a.json"
+    json_file.write_text('{"name": "A", "module": null, "big": -9223372036854775809}')
+
+    assert fix_null_modules._fix_custom_file(str(json_file), "HR") == ["A"]
+    assert json.loads(json_file.read_text()) == {"name": "A", "module": "HR", "big": -9223372036854775809}
+    assert '"big": -9223372036854775809' in json_file.read_text()
+
+
+STREAM_FIXTURE = [
+    {
+        "name": "F1",
+        "module": None,
+        "label": "é\n\"quoted\"",
+        "ratio": 1.5,
+        "child": [{"name": "C1", "module": None}, {"module": None}],
+    },
+    {"module": None},
+    {"name": "K", "module": "Keep", "empty_list": [], "empty_dict": {}},
+]
+
+
+@pytest.fixture
+def stream_all(monkeypatch):
+    pytest.importorskip("ijson")
+    monkeypatch.setattr(fix_null_modules, "_STREAM_MIN_BYTES", 0)
+
+
+def test_stream_output_matches_write_json(tmp_path, stream_all):
+    streamed = tmp_path / "streamed.json"
+    streamed.write_text(json.dumps(STREAM_FIXTURE, indent=1))
+
+    counts = fix_null_modules._stream_fix_fixture_file(str(streamed), {"F1": "HR"}, "App")
+
+    expected = tmp_path / "expected.json"
+    data, updated, skipped = fix_null_modules.replace_module_in_json_in_fixture(
+        json.loads(json.dumps(STREAM_FIXTURE)), {"F1": "HR"}, "App"
+    )
+    expected.write_text("")
+    fix_null_modules._write_json(str(expected), data)
+
+    assert counts == (updated, skipped) == (2, 2)
+    assert streamed.read_bytes() == expected.read_bytes()
+    assert sorted(os.listdir(tmp_path)) == ["expected.json", "streamed.json"]
+
+
+def test_stream_leaves_file_untouched_when_nothing_fixable(tmp_path, stream_all):
+    json_file = tmp_path / "a.json"
+    json_file.write_text('[{"module": null}]')
+
+    assert fix_null_modules._stream_fix_fixture_file(str(json_file), {}, "App") == (0, 1)
+    assert json_file.read_text() == '[{"module": null}]'
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+@pytest.mark.parametrize("raw", [
+    b'[{"name": "A", "module": null, "big": 123456789012345678901234}]',
+    b'[{"name": "A", "module": null, "f": NaN}]',
+])
+def test_stream_falls_back_to_full_load_when_ijson_raises(tmp_path, stream_all, raw):
+    json_file = tmp_path / "a.json"
+    json_file.write_bytes(raw)
+
+    assert fix_null_modules._stream_fix_fixture_file(str(json_file), {}, "App") is None
+    assert json_file.read_bytes() == raw
+
+    fix_null_modules._fix_fixture_file(str(json_file), {}, "App")
+
+    expected = json.loads(raw)
+    expected[0]["module"] = "App"
+    assert json.dumps(json.loads(json_file.read_bytes())) == json.dumps(expected)
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+@pytest.mark.parametrize("raw", [
+    b'[{"module": null, "s": "\\ud800"}]',
+    # An escaped backslash followed by "ud800", then a real lone \udc00.
+    b'[{"module": null, "s": "\\\\ud800\\udc00"}]',
+])
+def test_stream_falls_back_on_lone_surrogates(tmp_path, stream_all, raw):
+    json_file = tmp_path / "a.json"
+    json_file.write_bytes(raw)
+
+    assert fix_null_modules._stream_fix_fixture_file(str(json_file), {}, "App") is None
+
+    fix_null_modules._fix_fixture_file(str(json_file), {}, "App")
+
+    assert json_file.read_bytes() == raw
+    assert os.listdir(tmp_path) == ["a.json"]